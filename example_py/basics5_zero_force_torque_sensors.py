@@ -65,8 +65,10 @@ def main():
         # Zero Sensors
         # ==========================================================================================
         # Get and print the current TCP force/moment readings
+        ext_wrench = robot.states().ext_wrench_in_world
         logger.info(
-            f"TCP force and moment reading in world frame BEFORE sensor zeroing: {robot.states().ext_wrench_in_world} N-Nm"
+            "TCP force and moment reading in world frame BEFORE sensor zeroing: "
+            f"[{', '.join(f'{v:.4f}' for v in ext_wrench)}] N-Nm"
         )
 
         # Run the "ZeroFTSensor" primitive to automatically zero force and torque sensors
@@ -85,8 +87,10 @@ def main():
         logger.info("Sensor zeroing complete")
 
         # Get and print the current TCP force/moment readings
+        ext_wrench = robot.states().ext_wrench_in_world
         logger.info(
-            f"TCP force and moment reading in world frame AFTER sensor zeroing: {robot.states().ext_wrench_in_world} N-Nm"
+            "TCP force and moment reading in world frame AFTER sensor zeroing: "
+            f"[{', '.join(f'{v:.4f}' for v in ext_wrench)}] N-Nm"
         )
 
     except Exception as e:
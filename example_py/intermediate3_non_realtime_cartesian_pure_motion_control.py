@@ -28,6 +28,9 @@ SWING_FREQ = 0.3
 # External TCP force threshold for collision detection, value is only for demo purpose [N]
 EXT_FORCE_THRESHOLD = 10.0
 
+# Squared external TCP force threshold, compared against squared force magnitude to skip the sqrt
+EXT_FORCE_THRESHOLD_SQ = EXT_FORCE_THRESHOLD**2
+
 # External joint torque threshold for collision detection, value is only for demo purpose [Nm]
 EXT_TORQUE_THRESHOLD = 5.0
 
@@ -150,11 +153,72 @@ def main():
         # Set all Cartesian axis(s) to motion control
         robot.SetForceControlAxis([False, False, False, False, False, False])
 
+        # Get robot states once for the initial values below
+        states = robot.states()
+
         # Set initial pose to current TCP pose
-        init_pose = robot.states().tcp_pose.copy()
+        init_pose = states.tcp_pose.copy()
 
         # Save initial joint positions
-        init_q = robot.states().q.copy()
+        init_q = states.q.copy()
+
+        # Online Parameter Changes
+        # =========================================================================================
+        # Do the following operations in sequence for every 20 seconds. The schedule is keyed on
+        # integer loop ticks within the cycle, so each operation fires exactly once per cycle
+        # regardless of the command frequency
+        def set_ref_posture_1():
+            preferred_jnt_pos = [0.938, -1.108, -1.254, 1.464, 1.073, 0.278, -0.658]
+            robot.SetNullSpacePosture(preferred_jnt_pos)
+            logger.info(f"Reference joint positions set to {preferred_jnt_pos}")
+
+        def set_half_stiffness():
+            new_K = np.multiply(robot.info().K_x_nom, 0.5)
+            robot.SetCartesianImpedance(new_K)
+            logger.info(f"Cartesian stiffness set to {new_K}")
+
+        def set_ref_posture_2():
+            preferred_jnt_pos = [-0.938, -1.108, 1.254, 1.464, -1.073, 0.278, 0.658]
+            robot.SetNullSpacePosture(preferred_jnt_pos)
+            logger.info(f"Reference joint positions set to {preferred_jnt_pos}")
+
+        def reset_impedance():
+            robot.SetCartesianImpedance(robot.info().K_x_nom)
+            logger.info("Cartesian impedance properties are reset")
+
+        def reset_ref_posture():
+            robot.SetNullSpacePosture(init_q)
+            logger.info("Reference joint positions are reset")
+
+        def enable_max_wrench():
+            max_wrench = [10.0, 10.0, 10.0, 2.0, 2.0, 2.0]
+            robot.SetMaxContactWrench(max_wrench)
+            logger.info(f"Max contact wrench set to {max_wrench}")
+
+        def disable_max_wrench():
+            robot.SetMaxContactWrench([float("inf")] * 6)
+            logger.info("Max contact wrench regulation is disabled")
+
+        # Number of loop ticks in one 20-second cycle
+        ticks_per_cycle = 20 * frequency
+
+        # Map tick offset within the cycle to the operation to run
+        schedule = {
+            # Online change reference joint positions at 3 seconds
+            3 * frequency: set_ref_posture_1,
+            # Online change stiffness to half of nominal at 6 seconds
+            6 * frequency: set_half_stiffness,
+            # Online change to another reference joint positions at 9 seconds
+            9 * frequency: set_ref_posture_2,
+            # Online reset impedance properties to nominal at 12 seconds
+            12 * frequency: reset_impedance,
+            # Online reset reference joint positions to nominal at 14 seconds
+            14 * frequency: reset_ref_posture,
+            # Online enable max contact wrench regulation at 16 seconds
+            16 * frequency: enable_max_wrench,
+            # Disable max contact wrench regulation at 19 seconds
+            19 * frequency: disable_max_wrench,
+        }
 
         # Periodic Task
         # =========================================================================================
@@ -165,88 +229,81 @@ def main():
             f"Sending command to robot at {frequency} Hz, or {period} seconds interval"
         )
 
+        # Initialize target pose to initial pose, only its Y position is updated in the loop
+        target_pose = init_pose.copy()
+
+        # Sine-sweep phase and its constant increment per loop cycle [rad]
+        sweep_phase = 0.0
+        sweep_phase_step = 2.0 * math.pi * SWING_FREQ * period
+
+        # Pick the per-cycle target update and collision check once based on program arguments,
+        # so the loop does not need to check the arguments every cycle
+        def sweep_target():
+            nonlocal sweep_phase
+            # Sine-sweep TCP along Y axis
+            target_pose[1] = init_pose[1] + SWING_AMP * math.sin(sweep_phase)
+            # Advance phase and wrap it within one period to keep it small
+            sweep_phase += sweep_phase_step
+            if sweep_phase >= 2.0 * math.pi:
+                sweep_phase -= 2.0 * math.pi
+
+        def hold_target():
+            # Robot TCP holds at initial pose, nothing to update
+            pass
+
+        def check_collision():
+            # Simple collision detection at end-effector. Get robot states once per cycle and
+            # reuse it for all checks below
+            cur_states = robot.states()
+            fx, fy, fz = cur_states.ext_wrench_in_world[:3]
+            return fx * fx + fy * fy + fz * fz > EXT_FORCE_THRESHOLD_SQ or any(
+                abs(v) > EXT_TORQUE_THRESHOLD for v in cur_states.tau_ext
+            )
+
+        def skip_collision():
+            # Collision detection disabled
+            return False
+
+        update_target = hold_target if args.hold else sweep_target
+        collision_detected = check_collision if args.collision else skip_collision
+
+        # Start time of the periodic loop, each cycle is scheduled against this absolute reference
+        # so that the time spent on work in each cycle does not accumulate into drift
+        start_time = time.perf_counter()
+
         # Send command periodically at user-specified frequency
         while True:
-            # Use sleep to control loop period
-            time.sleep(period)
+            # Sleep until the absolute deadline of this cycle to control loop period
+            deadline = start_time + (loop_counter + 1) * period
+            time_to_sleep = deadline - time.perf_counter()
+            if time_to_sleep > 0:
+                time.sleep(time_to_sleep)
+            # If the loop has fallen more than one period behind, resync the start time instead
+            # of catching up, which would send a burst of commands to the robot
+            elif time_to_sleep < -period:
+                start_time = time.perf_counter() - (loop_counter + 1) * period
 
             # Monitor fault on the connected robot
             if robot.fault():
                 raise Exception("Fault occurred on the connected robot, exiting ...")
 
-            # Initialize target pose to initial pose
-            target_pose = init_pose.copy()
+            # Update target pose, either sine-sweep or hold
+            update_target()
 
-            # Sine-sweep TCP along Y axis
-            if not args.hold:
-                target_pose[1] = init_pose[1] + SWING_AMP * math.sin(
-                    2 * math.pi * SWING_FREQ * loop_counter * period
-                )
-            # Otherwise robot TCP will hold at initial pose
-
-            # Send command. Calling this method with only target pose input results
-            # in pure motion control
+            # Send command. Calling this method with only target pose input results in pure
+            # motion control
             robot.SendCartesianMotionForce(target_pose)
 
-            #  Do the following operations in sequence for every 20 seconds
-            time_elapsed = loop_counter * period
-            # Online change reference joint positions at 3 seconds
-            if time_elapsed % 20.0 == 3.0:
-                preferred_jnt_pos = [0.938, -1.108, -1.254, 1.464, 1.073, 0.278, -0.658]
-                robot.SetNullSpacePosture(preferred_jnt_pos)
-                logger.info(f"Reference joint positions set to {preferred_jnt_pos}")
-            # Online change stiffness to half of nominal at 6 seconds
-            elif time_elapsed % 20.0 == 6.0:
-                new_K = np.multiply(robot.info().K_x_nom, 0.5)
-                robot.SetCartesianImpedance(new_K)
-                logger.info(f"Cartesian stiffness set to {new_K}")
-            # Online change to another reference joint positions at 9 seconds
-            elif time_elapsed % 20.0 == 9.0:
-                preferred_jnt_pos = [-0.938, -1.108, 1.254, 1.464, -1.073, 0.278, 0.658]
-                robot.SetNullSpacePosture(preferred_jnt_pos)
-                logger.info(f"Reference joint positions set to {preferred_jnt_pos}")
-            # Online reset impedance properties to nominal at 12 seconds
-            elif time_elapsed % 20.0 == 12.0:
-                robot.SetCartesianImpedance(robot.info().K_x_nom)
-                logger.info("Cartesian impedance properties are reset")
-            # Online reset reference joint positions to nominal at 14 seconds
-            elif time_elapsed % 20.0 == 14.0:
-                robot.SetNullSpacePosture(init_q)
-                logger.info("Reference joint positions are reset")
-            # Online enable max contact wrench regulation at 16 seconds
-            elif time_elapsed % 20.0 == 16.0:
-                max_wrench = [10.0, 10.0, 10.0, 2.0, 2.0, 2.0]
-                robot.SetMaxContactWrench(max_wrench)
-                logger.info(f"Max contact wrench set to {max_wrench}")
-            # Disable max contact wrench regulation at 19 seconds
-            elif time_elapsed % 20.0 == 19.0:
-                robot.SetMaxContactWrench([float("inf")] * 6)
-                logger.info("Max contact wrench regulation is disabled")
-
-            # Simple collision detection: stop robot if collision is detected at
-            # end-effector
-            if args.collision:
-                collision_detected = False
-                ext_force = np.array(
-                    [
-                        robot.states().ext_wrench_in_world[0],
-                        robot.states().ext_wrench_in_world[1],
-                        robot.states().ext_wrench_in_world[2],
-                    ]
-                )
-                if np.linalg.norm(ext_force) > EXT_FORCE_THRESHOLD:
-                    collision_detected = True
-
-                for v in robot.states().tau_ext:
-                    if abs(v) > EXT_TORQUE_THRESHOLD:
-                        collision_detected = True
-
-                if collision_detected:
-                    robot.Stop()
-                    logger.warn(
-                        "Collision detected, stopping robot and exit program ..."
-                    )
-                    return
+            # Run the scheduled operation, if any, for this tick within the 20-second cycle
+            scheduled_op = schedule.get(loop_counter % ticks_per_cycle)
+            if scheduled_op is not None:
+                scheduled_op()
+
+            # Stop robot if collision is detected
+            if collision_detected():
+                robot.Stop()
+                logger.warn("Collision detected, stopping robot and exit program ...")
+                return
 
             # Increment loop counter
             loop_counter += 1
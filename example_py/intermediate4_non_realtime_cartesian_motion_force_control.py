@@ -178,13 +178,7 @@ def main():
         is_contacted = False
         while not is_contacted:
             # Compute norm of sensed external force applied on robot TCP
-            ext_force = np.array(
-                [
-                    robot.states().ext_wrench_in_world[0],
-                    robot.states().ext_wrench_in_world[1],
-                    robot.states().ext_wrench_in_world[2],
-                ]
-            )
+            ext_force = np.asarray(robot.states().ext_wrench_in_world[:3])
 
             # Contact is considered to be made if sensed TCP force exceeds the threshold
             if np.linalg.norm(ext_force) > PRESSING_FORCE:
@@ -77,8 +77,10 @@ def main():
 
         # Step dynamics engine 5 times
         for i in range(5):
-            # Update robot model in dynamics engine
-            model.Update(robot.states().q, robot.states().dtheta)
+            # Update robot model in dynamics engine, using joint positions and velocities from the
+            # same robot states snapshot
+            states = robot.states()
+            model.Update(states.q, states.dtheta)
 
             # Compute gravity vector
             g = model.g()
@@ -99,10 +101,11 @@ def main():
             print()
 
         # Check reachability of a Cartesian pose based on current pose
-        pose_to_check = robot.states().tcp_pose.copy()
+        states = robot.states()
+        pose_to_check = states.tcp_pose.copy()
         pose_to_check[0] += 0.1
         logger.info(f"Checking reachability of Cartesian pose {pose_to_check}")
-        result = model.reachable(pose_to_check, robot.states().q, True)
+        result = model.reachable(pose_to_check, states.q, True)
         logger.info(f"Got a result: reachable = {result[0]}, IK solution = {result[1]}")
 
     except Exception as e: